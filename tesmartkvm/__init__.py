@@ -5,8 +5,9 @@ Supports port switching, buzzer control, LCD timeout configuration,
 and auto input detection.
 """
 
-from .client import TESmartKVM
-from .config import Config, Connection, load_config
+from importlib import import_module
+from typing import TYPE_CHECKING
+
 from .exceptions import (
     TESmartError,
     CommunicationError,
@@ -15,6 +16,10 @@ from .exceptions import (
     InvalidValueError,
 )
 
+if TYPE_CHECKING:
+    from .client import TESmartKVM
+    from .config import Config, Connection, load_config
+
 __version__ = "0.1.0"
 __all__ = [
     "TESmartKVM",
@@ -27,3 +32,27 @@ __all__ = [
     "InvalidPortError",
     "InvalidValueError",
 ]
+
+# Public names imported on first access so that `import tesmartkvm` (and
+# with it every CLI invocation) does not pay for modules it never uses.
+_LAZY_ATTRS = {
+    "TESmartKVM": ".client",
+    "Config": ".config",
+    "Connection": ".config",
+    "load_config": ".config",
+}
+
+
+def __getattr__(name):
+    """Import lazily exported names on first access (PEP 562)."""
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """List module attributes including the lazily exported names."""
+    return sorted(set(globals()) | set(__all__))
@@ -1,13 +1,13 @@
 """Command-line interface for TESmart KVM control."""
 
 import argparse
+import io
 import sys
+from contextlib import redirect_stdout
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, List, Optional
 
 from . import __version__
-from .client import TESmartKVM
-from .config import Config, load_config
 from .exceptions import (
     CommunicationError,
     InvalidPortError,
@@ -15,10 +15,144 @@ from .exceptions import (
     TESmartError,
 )
 
+if TYPE_CHECKING:
+    from .client import TESmartKVM
+    from .config import Config
 
-def create_parser() -> argparse.ArgumentParser:
+
+# Command-line values -> setting values
+_BOOL_STATES = {"on": True, "off": False, "1": True, "0": False}
+_LCD_TIMEOUTS = {"off": 0, "0": 0, "10": 10, "30": 30}
+
+
+def _parse_choice(table: dict, value: str):
+    """Look up a command-line value, raising an argparse error if unknown."""
+    try:
+        return table[value]
+    except KeyError:
+        choices = ", ".join(repr(key) for key in table)
+        raise argparse.ArgumentTypeError(
+            f"invalid choice: {value!r} (choose from {choices})"
+        )
+
+
+def _on_off(value: str) -> bool:
+    """argparse type for on/off arguments."""
+    return _parse_choice(_BOOL_STATES, value)
+
+
+def _lcd_timeout(value: str) -> int:
+    """argparse type for LCD timeout arguments."""
+    return _parse_choice(_LCD_TIMEOUTS, value)
+
+
+def _build_get_parser(get_parser: argparse.ArgumentParser, argv: Optional[list]) -> None:
+    """Add the arguments of the 'get' command."""
+    get_parser.add_argument(
+        "property",
+        choices=("port",),
+        help="Property to get (only 'port' is supported by the KVM protocol)",
+    )
+
+
+def _build_set_port_parser(set_subparsers) -> None:
+    """Add the 'set port' subcommand."""
+    set_port_parser = set_subparsers.add_parser("port", help="Set active port")
+    set_port_parser.add_argument(
+        "value",
+        type=str,
+        help="Port number (1-16) or friendly name from config",
+    )
+    set_port_parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Check the active port before switching and read it back afterwards",
+    )
+
+
+def _build_set_buzzer_parser(set_subparsers) -> None:
+    """Add the 'set buzzer' subcommand."""
+    set_buzzer_parser = set_subparsers.add_parser("buzzer", help="Set buzzer state")
+    set_buzzer_parser.add_argument(
+        "value",
+        type=_on_off,
+        metavar="{on,off,1,0}",
+        help="Buzzer state (on/off or 1/0)",
+    )
+
+
+def _build_set_lcd_parser(set_subparsers) -> None:
+    """Add the 'set lcd' subcommand."""
+    set_lcd_parser = set_subparsers.add_parser("lcd", help="Set LCD timeout")
+    set_lcd_parser.add_argument(
+        "value",
+        type=_lcd_timeout,
+        metavar="{off,0,10,30}",
+        help="Timeout in seconds (off/0, 10, or 30)",
+    )
+
+
+def _build_set_auto_parser(set_subparsers) -> None:
+    """Add the 'set auto' subcommand."""
+    set_auto_parser = set_subparsers.add_parser("auto", help="Set auto input detection")
+    set_auto_parser.add_argument(
+        "value",
+        type=_on_off,
+        metavar="{on,off,1,0}",
+        help="Auto detection state (on/off or 1/0)",
+    )
+
+
+_SET_PROPERTY_BUILDERS = {
+    "port": _build_set_port_parser,
+    "buzzer": _build_set_buzzer_parser,
+    "lcd": _build_set_lcd_parser,
+    "auto": _build_set_auto_parser,
+}
+
+
+def _build_set_parser(set_parser: argparse.ArgumentParser, argv: Optional[list]) -> None:
+    """Add the property subcommands of the 'set' command.
+
+    When argv sets a single property right after 'set', only that one is
+    built. Otherwise (e.g. 'set --help', a typo or several properties) all
+    of them are built so that help and error messages list every choice.
+    """
+    set_subparsers = set_parser.add_subparsers(dest="property", help="Property to set")
+
+    tokens = argv[argv.index("set") + 1:] if argv is not None and "set" in argv else []
+    names = [token for token in tokens if token in _SET_PROPERTY_BUILDERS]
+    if len(names) == 1 and tokens[0] == names[0]:
+        _SET_PROPERTY_BUILDERS[names[0]](set_subparsers)
+        return
+
+    for build in _SET_PROPERTY_BUILDERS.values():
+        build(set_subparsers)
+
+
+def _build_list_parser(list_parser: argparse.ArgumentParser, argv: Optional[list]) -> None:
+    """The 'list' command takes no arguments."""
+
+
+# Command name -> (help text, builder for the command's own arguments)
+_COMMAND_BUILDERS = {
+    "list": ("List configured port names", _build_list_parser),
+    "get": ("Get current settings", _build_get_parser),
+    "set": ("Set KVM settings", _build_set_parser),
+}
+
+
+def create_parser(argv: Optional[list] = None) -> argparse.ArgumentParser:
     """Create and configure the argument parser.
 
+    Building every subcommand parser up front is wasted work for a single
+    invocation, so when argv is given only the subcommands it names get
+    their arguments added.
+
+    Args:
+        argv: Command-line arguments that will be parsed (default: build
+            the complete parser)
+
     Returns:
         Configured ArgumentParser instance
     """
@@ -32,12 +166,14 @@ Examples:
   teskvm list                   List configured port names
   teskvm set port 3             Switch to port 3
   teskvm set port workstation   Switch to port by name (from config)
+  teskvm set port 3 --verify    Switch to port 3 and confirm the switch
   teskvm set buzzer off         Disable buzzer
   teskvm set buzzer on          Enable buzzer
   teskvm set lcd 10             Set LCD timeout to 10 seconds
   teskvm set lcd off            Disable LCD timeout
   teskvm set auto on            Enable auto input detection
   teskvm set auto off           Disable auto input detection
+  teskvm set buzzer off lcd off Change several settings in one go
 
 Configuration:
   Settings can be stored in ~/.config/tesmartkvm/config.toml
@@ -78,7 +214,7 @@ Configuration:
     parser.add_argument(
         "--num-ports",
         type=int,
-        choices=[8, 16],
+        choices=(8, 16),
         help="Number of ports on the KVM (overrides config file)",
     )
 
@@ -97,59 +233,15 @@ Configuration:
 
     subparsers = parser.add_subparsers(dest="command", help="Command to execute")
 
-    subparsers.add_parser(
-        "list",
-        help="List configured port names",
-    )
-
-    get_parser = subparsers.add_parser(
-        "get",
-        help="Get current settings",
-    )
-    get_parser.add_argument(
-        "property",
-        choices=["port"],
-        help="Property to get (only 'port' is supported by the KVM protocol)",
-    )
-
-    set_parser = subparsers.add_parser(
-        "set",
-        help="Set KVM settings",
-    )
-    set_subparsers = set_parser.add_subparsers(dest="property", help="Property to set")
-
-    set_port_parser = set_subparsers.add_parser("port", help="Set active port")
-    set_port_parser.add_argument(
-        "value",
-        type=str,
-        help="Port number (1-16) or friendly name from config",
-    )
-
-    set_buzzer_parser = set_subparsers.add_parser("buzzer", help="Set buzzer state")
-    set_buzzer_parser.add_argument(
-        "value",
-        choices=["on", "off", "1", "0"],
-        help="Buzzer state (on/off or 1/0)",
-    )
-
-    set_lcd_parser = set_subparsers.add_parser("lcd", help="Set LCD timeout")
-    set_lcd_parser.add_argument(
-        "value",
-        choices=["off", "0", "10", "30"],
-        help="Timeout in seconds (off/0, 10, or 30)",
-    )
-
-    set_auto_parser = set_subparsers.add_parser("auto", help="Set auto input detection")
-    set_auto_parser.add_argument(
-        "value",
-        choices=["on", "off", "1", "0"],
-        help="Auto detection state (on/off or 1/0)",
-    )
+    for name, (help_text, build) in _COMMAND_BUILDERS.items():
+        command_parser = subparsers.add_parser(name, help=help_text)
+        if argv is None or name in argv:
+            build(command_parser, argv)
 
     return parser
 
 
-def handle_list(config: Config) -> int:
+def handle_list(config: "Config") -> int:
     """Handle the 'list' command to show port name mappings.
 
     Args:
@@ -169,13 +261,13 @@ def handle_list(config: Config) -> int:
 
     print("Configured port names:")
     sorted_ports = sorted(config.port_names.items(), key=lambda x: x[1])
-    max_name_len = max(len(name) for name in config.port_names.keys())
+    max_name_len = max(len(name) for name, _ in sorted_ports)
     for name, port_num in sorted_ports:
         print(f"  {name:<{max_name_len}} = {port_num}")
     return 0
 
 
-def handle_get_port(kvm: TESmartKVM, config: Config) -> int:
+def handle_get_port(kvm: "TESmartKVM", config: "Config") -> int:
     """Handle the 'get port' command.
 
     Args:
@@ -198,34 +290,42 @@ def handle_get_port(kvm: TESmartKVM, config: Config) -> int:
         return 1
 
 
-def handle_set_port(kvm: TESmartKVM, port_identifier: str, config: Config) -> int:
+def handle_set_port(
+    kvm: "TESmartKVM", port_identifier: str, config: "Config", verify: bool = False
+) -> int:
     """Handle the 'set port' command.
 
     Args:
         kvm: TESmartKVM instance
         port_identifier: Port number or friendly name
         config: Config instance for resolving port names
+        verify: Query the KVM before and after switching
 
     Returns:
         Exit code (0 for success)
     """
     port = config.resolve_port(port_identifier)
     if port is None:
-        print(f"Error: Invalid port '{port_identifier}'", file=sys.stderr)
-        print(f"Must be a number (1-{config.num_ports}) or a configured port name", file=sys.stderr)
+        msg = (
+            f"Error: Invalid port '{port_identifier}'\n"
+            f"Must be a number (1-{config.num_ports}) or a configured port name\n"
+        )
         if config.port_names:
-            print(f"Available port names: {', '.join(sorted(config.port_names.keys()))}", file=sys.stderr)
+            msg += f"Available port names: {', '.join(sorted(config.port_names.keys()))}\n"
+        sys.stderr.write(msg)
         return 1
 
     try:
-        result = kvm.set_port(port)
+        result = kvm.set_port(port, verify=verify, check_current=verify)
         new_port = result['new_port']
         port_name = config.get_port_name(new_port)
         if port_name:
             port_display = f"{new_port} ({port_name})"
         else:
             port_display = f"{new_port} (NO_ALIAS)"
-        if result["changed"]:
+        if result["changed"] is None:
+            print(f"Sent switch to port {port_display}")
+        elif result["changed"]:
             print(f"Switched to port {port_display}")
         else:
             print(f"Already on port {port_display}")
@@ -238,18 +338,17 @@ def handle_set_port(kvm: TESmartKVM, port_identifier: str, config: Config) -> in
         return 1
 
 
-def handle_set_buzzer(kvm: TESmartKVM, state: str) -> int:
+def handle_set_buzzer(kvm: "TESmartKVM", enabled: bool) -> int:
     """Handle the 'set buzzer' command.
 
     Args:
         kvm: TESmartKVM instance
-        state: Buzzer state (on/off/1/0)
+        enabled: True to enable the buzzer, False to disable it
 
     Returns:
         Exit code (0 for success)
     """
     try:
-        enabled = state in ["on", "1"]
         kvm.set_buzzer(enabled)
         print(f"Buzzer {'enabled' if enabled else 'disabled'}")
         return 0
@@ -258,25 +357,24 @@ def handle_set_buzzer(kvm: TESmartKVM, state: str) -> int:
         return 1
 
 
-def handle_set_lcd(kvm: TESmartKVM, timeout: str) -> int:
+def handle_set_lcd(kvm: "TESmartKVM", timeout: int) -> int:
     """Handle the 'set lcd' command.
 
     Args:
         kvm: TESmartKVM instance
-        timeout: Timeout value (off/0/10/30)
+        timeout: Timeout in seconds (0 to disable, 10, or 30)
 
     Returns:
         Exit code (0 for success)
     """
     try:
-        timeout_value = 0 if timeout in ["off", "0"] else int(timeout)
-        kvm.set_lcd_timeout(timeout_value)
-        if timeout_value == 0:
+        kvm.set_lcd_timeout(timeout)
+        if timeout == 0:
             print("LCD timeout disabled")
         else:
-            print(f"LCD timeout set to {timeout_value} seconds")
+            print(f"LCD timeout set to {timeout} seconds")
         return 0
-    except (InvalidValueError, ValueError) as e:
+    except InvalidValueError as e:
         print(f"Error: {e}", file=sys.stderr)
         return 1
     except TESmartError as e:
@@ -284,18 +382,17 @@ def handle_set_lcd(kvm: TESmartKVM, timeout: str) -> int:
         return 1
 
 
-def handle_set_auto(kvm: TESmartKVM, state: str) -> int:
+def handle_set_auto(kvm: "TESmartKVM", enabled: bool) -> int:
     """Handle the 'set auto' command.
 
     Args:
         kvm: TESmartKVM instance
-        state: Auto detection state (on/off/1/0)
+        enabled: True to enable auto input detection, False to disable it
 
     Returns:
         Exit code (0 for success)
     """
     try:
-        enabled = state in ["on", "1"]
         kvm.set_auto_detect(enabled)
         print(f"Auto input detection {'enabled' if enabled else 'disabled'}")
         return 0
@@ -304,6 +401,84 @@ def handle_set_auto(kvm: TESmartKVM, state: str) -> int:
         return 1
 
 
+_GET_HANDLERS = {
+    "port": lambda kvm, config, args: handle_get_port(kvm, config),
+}
+
+_SET_HANDLERS = {
+    "port": lambda kvm, config, args: handle_set_port(kvm, args.value, config, args.verify),
+    "buzzer": lambda kvm, config, args: handle_set_buzzer(kvm, args.value),
+    "lcd": lambda kvm, config, args: handle_set_lcd(kvm, args.value),
+    "auto": lambda kvm, config, args: handle_set_auto(kvm, args.value),
+}
+
+# Commands that talk to the KVM, keyed by command then property
+_NETWORK_COMMANDS = {
+    "get": _GET_HANDLERS,
+    "set": _SET_HANDLERS,
+}
+
+
+def parse_steps(parser: argparse.ArgumentParser, argv: list) -> List[argparse.Namespace]:
+    """Parse command-line arguments, allowing several settings after 'set'.
+
+    'teskvm set buzzer off lcd off' yields one namespace per property; every
+    other command yields a single namespace.
+
+    Args:
+        parser: Parser from create_parser()
+        argv: Command-line arguments
+
+    Returns:
+        List of parsed namespaces, in command-line order
+    """
+    args, extra = parser.parse_known_args(argv)
+    steps = [args]
+    if extra and args.command == "set":
+        # The parser may only know the first property; the rest need all of them
+        parser = create_parser()
+        # A leftover value rather than a property name is an unrecognized argument
+        while extra and extra[0][:1].isalpha():
+            step, extra = parser.parse_known_args(["set"] + extra)
+            steps.append(step)
+
+    if extra:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    return steps
+
+
+def run_set_batch(kvm: "TESmartKVM", config: "Config", steps: List[argparse.Namespace]) -> int:
+    """Run several 'set' steps, sending their commands to the KVM together.
+
+    Stops at the first step that fails; commands queued before it are
+    still sent. Success messages are printed only once the commands have
+    been sent.
+
+    Args:
+        kvm: TESmartKVM instance
+        config: Config instance for resolving port names
+        steps: Parsed 'set' namespaces from parse_steps()
+
+    Returns:
+        Exit code (0 for success)
+    """
+    # The handlers report success while their commands are only queued
+    output = io.StringIO()
+    status = 0
+    try:
+        with kvm.batch(), redirect_stdout(output):
+            for step in steps:
+                status = _SET_HANDLERS[step.property](kvm, config, step)
+                if status:
+                    break
+    except TESmartError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    sys.stdout.write(output.getvalue())
+    return status
+
+
 def main(argv: Optional[list] = None) -> int:
     """Main entry point for the CLI.
 
@@ -313,16 +488,23 @@ def main(argv: Optional[list] = None) -> int:
     Returns:
         Exit code
     """
-    parser = create_parser()
-    args = parser.parse_args(argv)
+    if argv is None:
+        argv = sys.argv[1:]
+
+    parser = create_parser(argv)
+    steps = parse_steps(parser, argv)
+    args = steps[0]
 
     if not args.command:
-        parser.print_help()
+        parser.print_help(sys.stderr)
         return 1
 
     config_path = args.config if args.config is not None else None
     connection_name = args.connection if args.connection is not None else None
 
+    # Loaded only after argparse has handled --help and --version
+    from .config import load_config
+
     try:
         config = load_config(config_path, connection_name)
         # Eagerly validate connection exists by accessing active_connection
@@ -331,6 +513,17 @@ def main(argv: Optional[list] = None) -> int:
         print(f"Error: {e}", file=sys.stderr)
         return 1
 
+    if args.command == "list":
+        return handle_list(config)
+
+    handler = _NETWORK_COMMANDS[args.command].get(args.property)
+    if handler is None:
+        parser.print_help(sys.stderr)
+        return 1
+
+    # Only network commands need the client (and its socket machinery)
+    from .client import TESmartKVM
+
     kvm_params = {}
     if args.host is not None:
         kvm_params["host"] = args.host
@@ -342,41 +535,19 @@ def main(argv: Optional[list] = None) -> int:
         kvm_params["delay"] = args.delay
     if args.num_ports is not None:
         kvm_params["num_ports"] = args.num_ports
-    if config_path is not None:
-        kvm_params["config_path"] = config_path
 
     try:
-        kvm = TESmartKVM(**kvm_params)
+        kvm = TESmartKVM(config=config, **kvm_params)
     except Exception as e:
         print(f"Error initializing KVM connection: {e}", file=sys.stderr)
         return 1
 
-    if args.command == "list":
-        return handle_list(config)
-    elif args.command == "get":
-        if args.property == "port":
-            return handle_get_port(kvm, config)
-        else:
-            print(f"Error: Cannot get '{args.property}' - not supported by KVM protocol", file=sys.stderr)
-            return 1
-    elif args.command == "set":
-        if not args.property:
-            parser.print_help()
-            return 1
-        if args.property == "port":
-            return handle_set_port(kvm, args.value, config)
-        elif args.property == "buzzer":
-            return handle_set_buzzer(kvm, args.value)
-        elif args.property == "lcd":
-            return handle_set_lcd(kvm, args.value)
-        elif args.property == "auto":
-            return handle_set_auto(kvm, args.value)
-        else:
-            parser.print_help()
-            return 1
-    else:
-        parser.print_help()
-        return 1
+    try:
+        if len(steps) > 1:
+            return run_set_batch(kvm, config, steps)
+        return handler(kvm, config, args)
+    finally:
+        kvm.close()
 
 
 if __name__ == "__main__":
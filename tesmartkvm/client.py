@@ -2,10 +2,11 @@
 
 import socket
 import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, List, Optional, Tuple
 
-from .config import load_config
+from .config import Config, load_config
 from .exceptions import (
     CommunicationError,
     InvalidPortError,
@@ -13,6 +14,9 @@ from .exceptions import (
     InvalidValueError,
 )
 from .protocol import (
+    MIN_RESPONSE_LENGTH,
+    PREAMBLE,
+    RESPONSE_LENGTH,
     decode_response,
     get_port_command,
     set_auto_detect_command,
@@ -22,6 +26,24 @@ from .protocol import (
 )
 
 
+# Socket options applied to every connection as (level, optname, value).
+# The KVM protocol exchanges tiny request/response packets, so Nagle's
+# algorithm only adds latency. Keepalive probes detect a connection the
+# KVM or a NAT in between has silently dropped while it sat idle.
+DEFAULT_SOCKET_OPTIONS: List[Tuple[int, int, int]] = [
+    (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+]
+
+# Keepalive timers are not available, or not settable, on every platform
+_KEEPALIVE_TIMERS = set()
+for _name, _value in (("TCP_KEEPIDLE", 30), ("TCP_KEEPINTVL", 5), ("TCP_KEEPCNT", 3)):
+    if hasattr(socket, _name):
+        _KEEPALIVE_TIMERS.add(getattr(socket, _name))
+        DEFAULT_SOCKET_OPTIONS.append((socket.IPPROTO_TCP, getattr(socket, _name), _value))
+del _name, _value
+
+
 class TESmartKVM:
     """Client for controlling TESmart KVM switches over TCP/IP.
 
@@ -30,7 +52,8 @@ class TESmartKVM:
     control, LCD timeout configuration, and auto input detection.
 
     Configuration is loaded from ~/.config/tesmartkvm/config.toml if it exists.
-    Explicit parameters override configuration file values.
+    Explicit parameters override configuration file values; when all of them
+    are given, the configuration file is not read at all.
 
     Args:
         host: IP address of the KVM (default: from config or 192.168.1.10)
@@ -39,6 +62,11 @@ class TESmartKVM:
         delay: Delay between commands in seconds for stability (default: from config or 1.0)
         num_ports: Number of ports on the KVM (default: from config or 16)
         config_path: Path to config file (default: ~/.config/tesmartkvm/config.toml)
+        config: Already loaded Config to take defaults from instead of reading
+            config_path
+        socket_options: List of (level, optname, value) tuples passed to
+            setsockopt() on each connection (default: DEFAULT_SOCKET_OPTIONS,
+            which enables TCP_NODELAY and keepalive)
     """
 
     def __init__(
@@ -49,20 +77,181 @@ class TESmartKVM:
         delay: Optional[float] = None,
         num_ports: Optional[int] = None,
         config_path: Optional[Path] = None,
+        config: Optional[Config] = None,
+        socket_options: Optional[List[Tuple[int, int, int]]] = None,
     ):
-        config = load_config(config_path)
+        # The config file is only needed for values not passed explicitly
+        explicit = (host, port, timeout, delay, num_ports)
+        if config is None and any(value is None for value in explicit):
+            config = load_config(config_path)
 
         self.host = host if host is not None else config.host
         self.port = port if port is not None else config.port
         self.timeout = timeout if timeout is not None else config.timeout
         self.delay = delay if delay is not None else config.delay
         self.num_ports = num_ports if num_ports is not None else config.num_ports
+        self.socket_options = (
+            list(socket_options) if socket_options is not None else list(DEFAULT_SOCKET_OPTIONS)
+        )
+        self._sock: Optional[socket.socket] = None
+        self._set_aside_sock: Optional[socket.socket] = None
+        self._reply_unread = False
+        # Whether the KVM keeps a connection open after replying; None until
+        # a reused connection has shown one way or the other
+        self._keeps_connections: Optional[bool] = None
+        self._last_send = 0.0
+        self._pending: Optional[List[bytes]] = None
+
+    def _apply_socket_options(self, sock: socket.socket) -> None:
+        """Apply the configured socket options to a connected socket.
+
+        Keepalive timers are best-effort: if the platform rejects them,
+        the system defaults are used.
+        """
+        for level, optname, value in self.socket_options:
+            try:
+                sock.setsockopt(level, optname, value)
+            except OSError:
+                if level != socket.IPPROTO_TCP or optname not in _KEEPALIVE_TIMERS:
+                    raise
+
+    def _get_sock(self) -> socket.socket:
+        """Return the connection to the KVM, opening it on first use.
+
+        The connection is reused across commands until close() is called
+        or a communication error forces a reconnect.
+
+        Returns:
+            Connected socket
+        """
+        if self._sock is None:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            try:
+                sock.settimeout(self.timeout)
+                sock.connect((self.host, self.port))
+                self._apply_socket_options(sock)
+            except BaseException:
+                sock.close()
+                raise
+            self._sock = sock
+        return self._sock
+
+    def _discard_pending_input(self, sock: socket.socket) -> None:
+        """Drop any unread bytes left on the connection.
+
+        This also notices a connection the KVM has closed since it was last
+        used, which sendall() alone would not report.
+
+        Args:
+            sock: Connected socket
+
+        Raises:
+            ConnectionError: If the KVM has closed the connection
+        """
+        sock.setblocking(False)
+        try:
+            while True:
+                if not sock.recv(64):
+                    raise ConnectionError("Connection closed by KVM")
+        except BlockingIOError:
+            pass
+        finally:
+            sock.settimeout(self.timeout)
+
+    def close(self) -> None:
+        """Close the connection to the KVM if one is open.
+
+        The write side is shut down before closing so the FIN follows any
+        command still in flight, rather than the close racing the data of a
+        fire-and-forget command sent just before.
+        """
+        sock, self._sock = self._sock, None
+        self._reply_unread = False
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_WR)
+            except OSError:
+                # Already disconnected
+                pass
+            sock.close()
+
+        if self._set_aside_sock is not None:
+            self._set_aside_sock.close()
+            self._set_aside_sock = None
+
+    def _set_aside(self) -> None:
+        """Stop using the connection without closing it yet.
+
+        Closing a connection while replies are still arriving on it resets
+        it, and the KVM may then drop commands it has not read yet. Only the
+        write side is shut down here, so the KVM can finish them; the
+        connection is closed by the next close() or _set_aside().
+        """
+        sock, self._sock = self._sock, None
+        self._reply_unread = False
+        if self._set_aside_sock is not None:
+            self._set_aside_sock.close()
+        self._set_aside_sock = sock
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_WR)
+            except OSError:
+                # Already disconnected
+                pass
+
+    def _get_ready_sock(self, expect_reply: bool = True) -> socket.socket:
+        """Return a connection that is still open and has no stale input.
+
+        A reused connection that the KVM has closed in the meantime is
+        replaced by a new one. This does not count against any retries, but
+        from then on every command gets its own connection.
+
+        Args:
+            expect_reply: Whether the command to be sent gets its reply read
+
+        Returns:
+            Connected socket
+        """
+        if self._keeps_connections is False:
+            # The KVM closes connections after replying
+            self.close()
+        elif not expect_reply and not self._keeps_connections:
+            # The check below can miss a close that is still in flight, and
+            # a command without a reply would be lost without any error, so
+            # only reuse a connection the KVM is known to keep open
+            self.close()
+
+        reused = self._sock is not None
+        sock = self._get_sock()
+        try:
+            self._discard_pending_input(sock)
+        except OSError:
+            if not reused:
+                raise
+            self._keeps_connections = False
+            self.close()
+            sock = self._get_sock()
+            self._discard_pending_input(sock)
+        return sock
+
+    def _wait_for_delay(self) -> None:
+        """Sleep until the configured delay has passed since the last command.
+
+        Only the remainder of the delay is slept, so time already spent
+        elsewhere between commands counts towards it.
+        """
+        if self._last_send:
+            remaining = self.delay - (time.monotonic() - self._last_send)
+            if remaining > 0:
+                time.sleep(remaining)
+        self._last_send = time.monotonic()
 
     def _send_command_no_response(self, command: bytes) -> None:
         """Send a command to the KVM without expecting a response.
 
         Used for commands like buzzer, LCD timeout, and auto-detect where
-        the KVM's responses are unreliable or non-standard.
+        the KVM's responses are unreliable or non-standard. Inside batch()
+        the command is queued instead of sent.
 
         Args:
             command: Raw command bytes to send
@@ -70,23 +259,29 @@ class TESmartKVM:
         Raises:
             CommunicationError: If communication fails
         """
+        if self._pending is not None:
+            self._pending.append(command)
+            return
+
         try:
-            if hasattr(self, '_command_sent'):
-                time.sleep(self.delay)
-            self._command_sent = True
+            self._wait_for_delay()
 
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-                sock.settimeout(self.timeout)
-                sock.connect((self.host, self.port))
-                sock.sendall(command)
-                # Don't wait for response - just close connection
+            self._get_ready_sock(expect_reply=False).sendall(command)
+            # Don't wait for the response; the next query reconnects rather
+            # than risk reading it as its own answer
+            self._reply_unread = True
+            return
 
         except socket.timeout as e:
-            raise CommunicationError(f"Connection timed out: {e}")
+            error = CommunicationError(f"Connection timed out: {e}")
         except socket.error as e:
-            raise CommunicationError(f"Socket error: {e}")
+            error = CommunicationError(f"Socket error: {e}")
         except Exception as e:
-            raise CommunicationError(f"Unexpected error: {e}")
+            error = CommunicationError(f"Unexpected error: {e}")
+
+        # Drop the broken connection so the next command reconnects
+        self.close()
+        raise error
 
     def _send_command(self, command: bytes, retries: int = 1) -> int:
         """Send a command to the KVM and return the response value.
@@ -102,42 +297,36 @@ class TESmartKVM:
             CommunicationError: If communication fails after all retries
             InvalidResponseError: If the response format is invalid
         """
+        # Queued commands must reach the KVM before anything that depends on them
+        self._flush_pending()
+
         last_error = None
 
-        for attempt in range(retries):
+        for _ in range(retries):
             try:
-                # Add delay for stability (except on first command)
-                if attempt > 0 or hasattr(self, '_command_sent'):
-                    time.sleep(self.delay)
-                self._command_sent = True
-
-                with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-                    sock.settimeout(self.timeout)
-                    sock.connect((self.host, self.port))
-                    sock.sendall(command)
-
-                    # Read response - typically 5-6 bytes
-                    # Format: AABB03 11 <value> [terminator]
-                    # Need at least 5 bytes to get the value
-                    response = b""
-                    while len(response) < 6:
-                        chunk = sock.recv(6 - len(response))
-                        if not chunk:
-                            break
-                        response += chunk
-                        # Need at least 5 bytes for a valid response with value
-                        if len(response) >= 5:
-                            try:
-                                return decode_response(response)
-                            except ValueError:
-                                # Not enough data yet, continue reading
-                                continue
-
-                    if not response:
-                        raise CommunicationError("No response received from KVM")
-
-                    # Final decode attempt with whatever we got
-                    return decode_response(response)
+                # Space commands out for stability (except the first)
+                self._wait_for_delay()
+
+                reused = (
+                    self._sock is not None
+                    and not self._reply_unread
+                    and self._keeps_connections is not False
+                )
+                try:
+                    value = self._exchange(command)
+                except ConnectionError:
+                    if not reused:
+                        raise
+                    # The KVM closed the reused connection; one attempt on a
+                    # new connection doesn't count as a retry
+                    self._keeps_connections = False
+                    self.close()
+                    return self._exchange(command)
+
+                if reused and self._keeps_connections is None:
+                    # A query answered on a reused connection
+                    self._keeps_connections = True
+                return value
 
             except socket.timeout as e:
                 last_error = CommunicationError(f"Connection timed out: {e}")
@@ -148,8 +337,100 @@ class TESmartKVM:
             except Exception as e:
                 last_error = CommunicationError(f"Unexpected error: {e}")
 
+            # Drop the connection so the next attempt starts clean
+            self.close()
+
         raise last_error
 
+    def _exchange(self, command: bytes) -> int:
+        """Send a command on the connection and read the response value.
+
+        Args:
+            command: Raw command bytes to send
+
+        Returns:
+            Response value byte from the KVM
+
+        Raises:
+            OSError: If communication fails
+            ValueError: If the response format is invalid
+        """
+        if self._reply_unread:
+            # A reply to a fire-and-forget command may still arrive, so the
+            # query goes out on a new connection
+            self._set_aside()
+
+        sock = self._get_ready_sock()
+        sock.sendall(command)
+
+        # Read response - typically 5-6 bytes
+        # Format: AABB03 11 <value> [terminator]
+        # Bytes before the preamble are left over from the previous reply
+        # (its terminator arriving late) and are skipped. Stop once there
+        # are enough bytes to get the value.
+        view = memoryview(bytearray(2 * RESPONSE_LENGTH))
+        received = 0
+        start = 0
+        while received - start < MIN_RESPONSE_LENGTH and received < len(view):
+            n = sock.recv_into(view[received:])
+            if not n:
+                break
+            received += n
+            while start < received and view[start] != PREAMBLE[0]:
+                start += 1
+
+        if not received:
+            raise ConnectionError("No response received from KVM")
+
+        return decode_response(bytes(view[start:received]))
+
+    def _flush_pending(self) -> None:
+        """Send the commands queued by batch() in a single write.
+
+        Raises:
+            CommunicationError: If communication fails
+        """
+        pending = self._pending
+        if not pending:
+            return
+
+        self._pending = None
+        try:
+            self._send_command_no_response(b"".join(pending))
+        finally:
+            pending.clear()
+            self._pending = pending
+
+    @contextmanager
+    def batch(self) -> Iterator["TESmartKVM"]:
+        """Queue fire-and-forget commands and send them in one write.
+
+        Inside the block, set_buzzer(), set_lcd_timeout(), set_auto_detect()
+        and set_port() without verify/check_current are queued rather than
+        sent. The queue is written to the KVM as a single packet when the
+        block exits normally, or earlier if a query needs the connection.
+        Queued commands are dropped if the block raises.
+
+        Example:
+            with kvm.batch():
+                kvm.set_buzzer(False)
+                kvm.set_lcd_timeout(0)
+
+        Raises:
+            CommunicationError: If sending the queued commands fails
+        """
+        if self._pending is not None:
+            # Nested batch: the outermost one sends the queue
+            yield self
+            return
+
+        self._pending = []
+        try:
+            yield self
+            self._flush_pending()
+        finally:
+            self._pending = None
+
     def get_port(self, retries: int = 3) -> int:
         """Get the currently active port.
 
@@ -167,17 +448,23 @@ class TESmartKVM:
         # Response is 0-indexed, convert to 1-indexed
         return response + 1
 
-    def set_port(self, port: int) -> dict:
+    def set_port(self, port: int, verify: bool = False, check_current: bool = False) -> dict:
         """Set the active port.
 
-        This method checks if the port is already active before switching.
-        If the port is already active, no command is sent.
+        By default only the switch command is sent, without waiting for a
+        reply. With check_current, the active port is queried first and no
+        command is sent if it is already active. With verify, the active port
+        is read back after switching.
 
         Args:
             port: Port number to activate (1 to num_ports)
+            verify: Read the active port back after switching (default: False)
+            check_current: Skip the switch if the port is already active (default: False)
 
         Returns:
-            Dictionary with 'old_port' and 'new_port' keys
+            Dictionary with 'old_port', 'new_port' and 'changed' keys.
+            'old_port' and 'changed' are None when the active port was not
+            queried before switching.
 
         Raises:
             InvalidPortError: If port is out of range
@@ -188,19 +475,26 @@ class TESmartKVM:
                 f"Invalid port: {port}. Must be between 1 and {self.num_ports}"
             )
 
-        old_port = self.get_port()
-
-        if old_port == port:
-            return {"old_port": old_port, "new_port": old_port, "changed": False}
+        old_port = None
+        if check_current:
+            old_port = self.get_port()
+            if old_port == port:
+                return {"old_port": old_port, "new_port": old_port, "changed": False}
 
         # Send set port command (port is 1-indexed, protocol uses hex value directly)
-        # Convert to hex value for the command
+        if not verify:
+            self._send_command_no_response(set_port_command(port))
+            changed = None if old_port is None else True
+            return {"old_port": old_port, "new_port": port, "changed": changed}
+
+        # Consume the reply so it can't be mistaken for the verification response
         self._send_command(set_port_command(port))
 
         # Verify the port was changed
         new_port = self.get_port()
+        changed = None if old_port is None else old_port != new_port
 
-        return {"old_port": old_port, "new_port": new_port, "changed": old_port != new_port}
+        return {"old_port": old_port, "new_port": new_port, "changed": changed}
 
     def set_buzzer(self, enabled: bool) -> None:
         """Enable or disable the buzzer.
@@ -247,9 +541,9 @@ class TESmartKVM:
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit."""
+        self.close()
         # Reset command tracking
-        if hasattr(self, '_command_sent'):
-            delattr(self, '_command_sent')
+        self._last_send = 0.0
         return False
 
     def __repr__(self) -> str:
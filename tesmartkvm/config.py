@@ -1,8 +1,11 @@
 """Configuration management for TESmart KVM library."""
 
 import os
+import sys
+import warnings
 from pathlib import Path
-from typing import Any, Dict, Optional
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple
 
 try:
     import tomllib
@@ -15,20 +18,70 @@ except ModuleNotFoundError:
 
 DEFAULT_CONFIG_PATH = Path.home() / ".config" / "tesmartkvm" / "config.toml"
 
-DEFAULT_CONNECTION_CONFIG = {
+# Read-only so that no Connection or caller can change the defaults
+DEFAULT_CONNECTION_CONFIG: Mapping[str, Any] = MappingProxyType({
     "host": "192.168.1.10",
     "port": 5000,
     "timeout": 5.0,
     "delay": 1.0,
     "num_ports": 16,
-    "port_names": {},
-}
+    "port_names": MappingProxyType({}),
+})
+
+# Connection settings read from the config file and their types
+_FIELD_COERCERS = (
+    ("host", str),
+    ("port", int),
+    ("timeout", float),
+    ("delay", float),
+    ("num_ports", int),
+)
+
+
+def _intern(name: Any) -> Any:
+    """Intern connection names so dict lookups can match on identity."""
+    return sys.intern(name) if isinstance(name, str) else name
+
+
+# Parsed config files by path, with the st_mtime_ns they were parsed at
+_toml_cache: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+
+
+def _read_toml(path: Path) -> Dict[str, Any]:
+    """Parse a TOML file, reusing the result while the file is unchanged.
+
+    The modification time is taken from the opened file, so an unchanged
+    file is opened but not read again. Callers must not modify the
+    returned data.
+    """
+    key = os.fspath(path)
+    with open(path, encoding="utf-8") as f:
+        mtime_ns = os.fstat(f.fileno()).st_mtime_ns
+        cached = _toml_cache.get(key)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+        toml_config = tomllib.loads(f.read())
+
+    _toml_cache[key] = (mtime_ns, toml_config)
+    return toml_config
 
 
 class Connection:
     """Represents a single KVM connection configuration."""
 
-    def __init__(self, name: str, config: Dict[str, Any]):
+    __slots__ = (
+        "name",
+        "host",
+        "port",
+        "timeout",
+        "delay",
+        "num_ports",
+        "port_names",
+        "_name_by_port",
+        "params",
+    )
+
+    def __init__(self, name: str, config: Mapping[str, Any]):
         """Initialize a connection.
 
         Args:
@@ -41,7 +94,24 @@ class Connection:
         self.timeout = config.get("timeout", DEFAULT_CONNECTION_CONFIG["timeout"])
         self.delay = config.get("delay", DEFAULT_CONNECTION_CONFIG["delay"])
         self.num_ports = config.get("num_ports", DEFAULT_CONNECTION_CONFIG["num_ports"])
-        self.port_names = config.get("port_names", {})
+        # Names are stored lowercased so lookups can skip normalizing them
+        self.port_names = {
+            str(name).lower(): num for name, num in (config.get("port_names") or {}).items()
+        }
+
+        # Reverse index for get_port_name(); the first name wins for shared ports
+        self._name_by_port: Dict[int, str] = {}
+        for name, num in self.port_names.items():
+            self._name_by_port.setdefault(num, name)
+
+        # Keyword arguments for TESmartKVM
+        self.params: Dict[str, Any] = {
+            "host": self.host,
+            "port": self.port,
+            "timeout": self.timeout,
+            "delay": self.delay,
+            "num_ports": self.num_ports,
+        }
 
     def resolve_port(self, port_identifier: str) -> Optional[int]:
         """Resolve a port identifier (name or number) to a port number.
@@ -52,15 +122,26 @@ class Connection:
         Returns:
             Port number if valid, None if invalid
         """
-        # Try to parse as integer first
-        try:
-            port_num = int(port_identifier)
-            if 1 <= port_num <= self.num_ports:
-                return port_num
-            return None
-        except ValueError:
-            # Not a number, try as a name
-            return self.port_names.get(port_identifier.lower())
+        # Only numeric-looking identifiers are parsed, so resolving a name
+        # doesn't raise and catch a ValueError. int() ignores surrounding
+        # whitespace, so the check does too.
+        number = port_identifier.strip()
+        if number.isdigit() or number[:1] in ("+", "-"):
+            try:
+                port_num = int(number)
+            except ValueError:
+                # e.g. a port name starting with '-'
+                pass
+            else:
+                if 1 <= port_num <= self.num_ports:
+                    return port_num
+                return None
+
+        # Not a number, try as a name; only mixed-case input needs lowering
+        port_num = self.port_names.get(port_identifier)
+        if port_num is None:
+            port_num = self.port_names.get(port_identifier.lower())
+        return port_num
 
     def get_port_name(self, port_number: int) -> Optional[str]:
         """Get the friendly name for a port number.
@@ -71,10 +152,7 @@ class Connection:
         Returns:
             Port name if defined, None otherwise
         """
-        for name, num in self.port_names.items():
-            if num == port_number:
-                return name
-        return None
+        return self._name_by_port.get(port_number)
 
     def __repr__(self) -> str:
         """String representation."""
@@ -84,6 +162,9 @@ class Connection:
 class Config:
     """Configuration manager for TESmart KVM.
 
+    The configuration file is read on first access to a connection, not
+    when the Config is created.
+
     Configuration format:
         default_connection = "home"
 
@@ -116,31 +197,30 @@ class Config:
         self.config_path = config_path or DEFAULT_CONFIG_PATH
         self._connections: Dict[str, Connection] = {}
         self._default_connection_name: Optional[str] = None
-        self._requested_connection_name = connection_name
-        self._load_config()
+        self._requested_connection_name = _intern(connection_name)
+        self._loaded = False
+        self._active: Optional[Connection] = None
+
+    def _ensure_loaded(self):
+        """Load the configuration file on first use."""
+        if not self._loaded:
+            self._loaded = True
+            self._load_config()
 
     def _load_config(self):
         """Load configuration from TOML file."""
-        if not self.config_path.exists():
-            # No config file, use defaults
-            self._connections["default"] = Connection("default", DEFAULT_CONNECTION_CONFIG)
-            self._default_connection_name = "default"
-            return
-
         if tomllib is None:
-            import warnings
-            warnings.warn(
-                "TOML library not available. Install 'tomli' for Python < 3.11 "
-                "to use configuration files. Using default configuration.",
-                UserWarning
-            )
-            self._connections["default"] = Connection("default", DEFAULT_CONNECTION_CONFIG)
-            self._default_connection_name = "default"
+            if self.config_path.exists():
+                warnings.warn(
+                    "TOML library not available. Install 'tomli' for Python < 3.11 "
+                    "to use configuration files. Using default configuration.",
+                    UserWarning
+                )
+            self._use_default_connection()
             return
 
         try:
-            with open(self.config_path, "rb") as f:
-                toml_config = tomllib.load(f)
+            toml_config = _read_toml(self.config_path)
 
             # Require multi-connection format
             if "connections" not in toml_config:
@@ -152,46 +232,50 @@ class Config:
 
             self._load_multi_connection_config(toml_config)
 
+        except FileNotFoundError:
+            # No config file, use defaults
+            self._use_default_connection()
+
         except Exception as e:
-            import warnings
             warnings.warn(
                 f"Failed to load config from {self.config_path}: {e}. "
                 "Using default configuration.",
                 UserWarning
             )
-            self._connections["default"] = Connection("default", DEFAULT_CONNECTION_CONFIG)
-            self._default_connection_name = "default"
+            self._use_default_connection()
+
+    def _use_default_connection(self):
+        """Fall back to a single connection with default settings."""
+        self._connections["default"] = Connection("default", DEFAULT_CONNECTION_CONFIG)
+        self._default_connection_name = "default"
 
     def _load_multi_connection_config(self, toml_config: Dict[str, Any]):
         """Load multi-connection configuration format."""
-        self._default_connection_name = toml_config.get("default_connection")
+        self._default_connection_name = _intern(toml_config.get("default_connection"))
 
         connections_config = toml_config["connections"]
 
         for conn_name, conn_data in connections_config.items():
-            config = DEFAULT_CONNECTION_CONFIG.copy()
-
-            if "host" in conn_data:
-                config["host"] = str(conn_data["host"])
-            if "port" in conn_data:
-                config["port"] = int(conn_data["port"])
-            if "timeout" in conn_data:
-                config["timeout"] = float(conn_data["timeout"])
-            if "delay" in conn_data:
-                config["delay"] = float(conn_data["delay"])
-            if "num_ports" in conn_data:
-                config["num_ports"] = int(conn_data["num_ports"])
-
-            if "ports" in conn_data:
+            # Only settings present in the file; Connection fills in defaults
+            config = {}
+
+            for key, coerce in _FIELD_COERCERS:
+                value = conn_data.get(key)
+                if value is not None:
+                    config[key] = coerce(value)
+
+            ports = conn_data.get("ports")
+            if ports is not None:
                 config["port_names"] = self._parse_port_names(
-                    conn_data["ports"],
-                    config["num_ports"]
+                    ports,
+                    config.get("num_ports", DEFAULT_CONNECTION_CONFIG["num_ports"])
                 )
 
+            conn_name = _intern(conn_name)
             self._connections[conn_name] = Connection(conn_name, config)
 
         if not self._default_connection_name and self._connections:
-            self._default_connection_name = list(self._connections.keys())[0]
+            self._default_connection_name = next(iter(self._connections))
 
     def _parse_port_names(self, ports_dict: Dict[str, Any], num_ports: int) -> Dict[str, int]:
         """Parse and validate port name mappings.
@@ -204,24 +288,24 @@ class Config:
             Validated port name mappings
         """
         port_names = {}
-        for name, port_num in ports_dict.items():
+        for name, value in ports_dict.items():
             try:
-                port_num = int(port_num)
-                if 1 <= port_num <= num_ports:
-                    port_names[str(name).lower()] = port_num
-                else:
-                    import warnings
-                    warnings.warn(
-                        f"Port name '{name}' has invalid port number {port_num}. "
-                        f"Must be between 1 and {num_ports}. Ignoring.",
-                        UserWarning
-                    )
+                port_num = int(value)
             except (ValueError, TypeError):
-                import warnings
                 warnings.warn(
                     f"Port name '{name}' has invalid value. Ignoring.",
                     UserWarning
                 )
+                continue
+
+            if 1 <= port_num <= num_ports:
+                port_names[str(name).lower()] = port_num
+            else:
+                warnings.warn(
+                    f"Port name '{name}' has invalid port number {port_num}. "
+                    f"Must be between 1 and {num_ports}. Ignoring.",
+                    UserWarning
+                )
         return port_names
 
     @property
@@ -234,20 +318,31 @@ class Config:
         Raises:
             ValueError: If requested connection doesn't exist
         """
+        if self._active is None:
+            self._active = self._resolve_active_connection()
+        return self._active
+
+    def _resolve_active_connection(self) -> Connection:
+        """Pick the requested, default or first connection."""
+        self._ensure_loaded()
+
         if self._requested_connection_name:
-            if self._requested_connection_name not in self._connections:
+            connection = self._connections.get(self._requested_connection_name)
+            if connection is None:
                 available = ", ".join(self._connections.keys())
                 raise ValueError(
                     f"Connection '{self._requested_connection_name}' not found. "
                     f"Available connections: {available}"
                 )
-            return self._connections[self._requested_connection_name]
+            return connection
 
-        if self._default_connection_name and self._default_connection_name in self._connections:
-            return self._connections[self._default_connection_name]
+        if self._default_connection_name:
+            connection = self._connections.get(self._default_connection_name)
+            if connection is not None:
+                return connection
 
         if self._connections:
-            return list(self._connections.values())[0]
+            return next(iter(self._connections.values()))
 
         # Should not happen, but return a default connection
         return Connection("default", DEFAULT_CONNECTION_CONFIG)
@@ -255,11 +350,13 @@ class Config:
     @property
     def connection_names(self) -> list[str]:
         """Get list of configured connection names."""
+        self._ensure_loaded()
         return list(self._connections.keys())
 
     @property
     def default_connection_name(self) -> Optional[str]:
         """Get the default connection name."""
+        self._ensure_loaded()
         return self._default_connection_name
 
     # Convenience properties that delegate to active connection
@@ -307,17 +404,12 @@ class Config:
         Returns:
             Dictionary with host, port, timeout, delay, num_ports
         """
-        conn = self.active_connection
-        return {
-            "host": conn.host,
-            "port": conn.port,
-            "timeout": conn.timeout,
-            "delay": conn.delay,
-            "num_ports": conn.num_ports,
-        }
+        # Copy so callers can't modify the connection's own dict
+        return dict(self.active_connection.params)
 
     def __repr__(self) -> str:
         """String representation."""
+        self._ensure_loaded()
         return (
             f"Config(path='{self.config_path}', "
             f"connections={list(self._connections.keys())}, "
@@ -335,4 +427,4 @@ def load_config(config_path: Optional[Path] = None, connection_name: Optional[st
     Returns:
         Config instance
     """
-    return Config(config_path, connection_name)
+    return Config(Path(config_path) if config_path else None, connection_name)
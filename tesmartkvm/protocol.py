@@ -1,13 +1,18 @@
 """Protocol implementation for TESmart KVM communication."""
 
-from typing import Tuple
+import struct
 
 
 # Protocol constants
 PREAMBLE = bytes([0xAA, 0xBB, 0x03])
+_PREAMBLE_HEX = PREAMBLE.hex()
 TERMINATOR = 0xEE
 RESPONSE_TOKEN = 0x11
 
+# Response sizes: AABB03 11 <value> [terminator]
+RESPONSE_LENGTH = 6
+MIN_RESPONSE_LENGTH = 5  # Enough to read the value byte
+
 # Command tokens
 CMD_SET_PORT = 0x01
 CMD_SET_BUZZER = 0x02
@@ -16,6 +21,10 @@ CMD_SET_AUTO_DETECT = 0x81
 CMD_GET_PORT = 0x10
 
 
+# Command layout: preamble, token, value, terminator
+_pack_command = struct.Struct(">3sBBB").pack
+
+
 def encode_command(token: int, value: int) -> bytes:
     """Encode a command to send to the KVM.
 
@@ -25,8 +34,27 @@ def encode_command(token: int, value: int) -> bytes:
 
     Returns:
         Encoded command bytes in format: AABB03<token><value>EE
+
+    Raises:
+        ValueError: If token or value doesn't fit in a byte
     """
-    return PREAMBLE + bytes([token, value, TERMINATOR])
+    try:
+        return _pack_command(PREAMBLE, token, value, TERMINATOR)
+    except struct.error as e:
+        raise ValueError("bytes must be in range(0, 256)") from e
+
+
+# Commands with fixed encodings, built once at import
+_GET_PORT_COMMAND = encode_command(CMD_GET_PORT, 0x00)
+_BUZZER_ON_COMMAND = encode_command(CMD_SET_BUZZER, 0x01)
+_BUZZER_OFF_COMMAND = encode_command(CMD_SET_BUZZER, 0x00)
+_AUTO_DETECT_ON_COMMAND = encode_command(CMD_SET_AUTO_DETECT, 0x01)
+_AUTO_DETECT_OFF_COMMAND = encode_command(CMD_SET_AUTO_DETECT, 0x00)
+_LCD_TIMEOUT_COMMANDS = {
+    0: encode_command(CMD_SET_LCD_TIMEOUT, 0x00),
+    10: encode_command(CMD_SET_LCD_TIMEOUT, 0x0A),
+    30: encode_command(CMD_SET_LCD_TIMEOUT, 0x1E),
+}
 
 
 def decode_response(response: bytes) -> int:
@@ -46,27 +74,24 @@ def decode_response(response: bytes) -> int:
     Raises:
         ValueError: If the response format is invalid
     """
-    if len(response) < 4:
-        raise ValueError(f"Response too short: expected at least 4 bytes, got {len(response)}")
+    length = len(response)
+    if length < 4:
+        raise ValueError(f"Response too short: expected at least 4 bytes, got {length}")
 
     # Check preamble
-    if response[:3] != PREAMBLE:
-        raise ValueError(f"Invalid preamble: expected {PREAMBLE.hex()}, got {response[:3].hex()}")
+    if not response.startswith(PREAMBLE):
+        raise ValueError(f"Invalid preamble: expected {_PREAMBLE_HEX}, got {response[:3].hex()}")
 
     # Extract the value byte based on response length
     # The bash script uses: echo $response | cut -c 9-10
     # Which extracts byte index 4 from hex string (positions 9-10 = 5th byte)
-    if len(response) >= 5:
-        # Standard format: AABB03 11 <value> [EE]
-        return response[4]
-    else:
-        # Short format: AABB03 <value>
-        return response[3]
+    # Standard format: AABB03 11 <value> [EE]; short format: AABB03 <value>
+    return response[4] if length >= 5 else response[3]
 
 
 def get_port_command() -> bytes:
     """Create a command to get the current active port."""
-    return encode_command(CMD_GET_PORT, 0x00)
+    return _GET_PORT_COMMAND
 
 
 def set_port_command(port: int) -> bytes:
@@ -91,7 +116,7 @@ def set_buzzer_command(enabled: bool) -> bytes:
     Returns:
         Encoded command bytes
     """
-    return encode_command(CMD_SET_BUZZER, 0x01 if enabled else 0x00)
+    return _BUZZER_ON_COMMAND if enabled else _BUZZER_OFF_COMMAND
 
 
 def set_lcd_timeout_command(timeout: int) -> bytes:
@@ -106,16 +131,10 @@ def set_lcd_timeout_command(timeout: int) -> bytes:
     Raises:
         ValueError: If timeout is not a valid value
     """
-    timeout_map = {
-        0: 0x00,
-        10: 0x0A,
-        30: 0x1E,
-    }
-
-    if timeout not in timeout_map:
-        raise ValueError(f"Invalid timeout: {timeout}. Must be 0, 10, or 30")
-
-    return encode_command(CMD_SET_LCD_TIMEOUT, timeout_map[timeout])
+    try:
+        return _LCD_TIMEOUT_COMMANDS[timeout]
+    except KeyError:
+        raise ValueError(f"Invalid timeout: {timeout}. Must be 0, 10, or 30") from None
 
 
 def set_auto_detect_command(enabled: bool) -> bytes:
@@ -127,4 +146,4 @@ def set_auto_detect_command(enabled: bool) -> bytes:
     Returns:
         Encoded command bytes
     """
-    return encode_command(CMD_SET_AUTO_DETECT, 0x01 if enabled else 0x00)
+    return _AUTO_DETECT_ON_COMMAND if enabled else _AUTO_DETECT_OFF_COMMAND